@@ -23,6 +23,14 @@
           autojsdoc_members = True
           autojsdoc_title = True
 
+          # optional: cap the diagnostics output
+          autojsdoc_diagnostics_limit  = { 'undocumented-param' : 20 }
+          autojsdoc_diagnostics_report = 'doc_src/jsdoc/diagnostics.json'
+
+          # optional: move the classes of modules with more than 200 members
+          # into generated pages (in the subdirectory autojsdoc of your sources)
+          autojsdoc_split_members = 200
+
     - in your documentation use:
 
        .. code::
@@ -32,15 +40,24 @@
        where the arguments are regular expressions matched against the longname
        attribute in structure.json.
 
+       .. code::
+
+          .. js:autofile:: src/my/*.js
+
+       where the arguments are globs matched against the source path of the
+       doclets in structure.json.
+
     :copyright: Copyright 2019 by Marcello Perathoner <marcello@perathoner.de>
     :license: BSD, see LICENSE for details.
 
 """
 
 import collections
+import itertools
 import json as jsonlib
 import operator
 import os
+import pathlib
 import re
 from typing import Any, Callable, Dict, Iterator, List, Sequence, Set, Tuple, Union # noqa
 
@@ -69,6 +86,16 @@ RE_AUTOSTRIP = re.compile (r'^js:auto') # strip directive name to obtain objtype
 RE_ID_SEP    = re.compile (r'([.#~])')  # JSDoc uses these separators in identifiers
 RE_BRACES    = re.compile (r'(\s*\(.*\))')
 RE_WS        = re.compile (r'(\s+)')
+RE_DOCNAME   = re.compile (r'[^\w.-]')   # chars not allowed in generated docnames
+
+STUB_MARKER = '.. generated by sphinxcontrib.autojsdoc, do not edit'
+""" First line of every stub.  Only files starting with it are overwritten or removed. """
+
+SPLIT_TITLES = {                          # JSDoc @kind => title of split-off group
+    'constant' : 'constants',
+    'function' : 'functions',
+    'member'   : 'attributes',
+}
 
 loaded_structure_files = {}
 
@@ -88,6 +115,10 @@ def strip_directive (name):
     """
     return RE_AUTOSTRIP.sub ('', name)
 
+def normalize_path (path):
+    """ Normalize a source path for use as index key. """
+    return os.path.normcase (os.path.normpath (path))
+
 def bs (link):
     """ Replace \\ with \\\\ because RST wants it that way. """
     return link.replace ('\\', '\\\\')
@@ -100,10 +131,22 @@ def setup (app):
     app.add_directive_to_domain ('js', 'automodule',   AutoDirective)
     app.add_directive_to_domain ('js', 'autoclass',    AutoDirective, override = True)
     app.add_directive_to_domain ('js', 'autofunction', AutoDirective, override = True)
+    app.add_directive_to_domain ('js', 'autofile',     AutoDirective)
+    app.add_directive_to_domain ('js', 'autoconstant', AutoDirective)
+    app.add_directive_to_domain ('js', 'automember',   AutoDirective)
 
     app.add_config_value (NAME + '_structure_json', '', False)
     app.add_config_value (NAME + '_members', False, False)
     app.add_config_value (NAME + '_title', False, False)
+    app.add_config_value (NAME + '_diagnostics_limit', 0, False, types = (int, dict))
+    app.add_config_value (NAME + '_diagnostics_report', '', False)
+    app.add_config_value (NAME + '_split_members', 0, 'env')
+    app.add_config_value (NAME + '_split_lines', 0, 'env')
+    app.add_config_value (NAME + '_split_group', 20, 'env')
+    app.add_config_value (NAME + '_split_dir', 'autojsdoc', 'env')
+
+    app.connect ('builder-inited', load_structure_file)
+    app.connect ('builder-inited', write_stubs)
 
     return {
         'version'            : __version__,
@@ -131,6 +174,109 @@ class AutoJSDocError (SphinxError):
     category = NAME + ' error'
 
 
+class Diagnostics (object):
+    """ Collects the problems found while merging the structure file.
+
+    Every problem is recorded as a compact tuple.  The location of the doclet
+    is resolved and the logger is called only when the diagnostics are
+    emitted, once, at the end of the merge.  Problems are grouped by file and
+    category and each category is capped.
+
+    :param limit: Max. no. of problems to output per category.  Either an int
+                  that applies to all categories or a dict category => int.
+                  0 or a missing key means unlimited.
+    :param str report: Path of a JSON file to write all problems to, or ''.
+    """
+
+    def __init__ (self, limit = 0, report = ''):
+        self.limit   = limit
+        self.report  = report
+        self.records = [] # type: List[Tuple[str, str, Any, str]]
+
+    def __len__ (self):
+        return len (self.records)
+
+    def add (self, level, category, doclet, msg):
+        self.records.append ((level, category, doclet, msg))
+
+    def warn (self, category, doclet, msg):
+        self.add ('warning', category, doclet, msg)
+
+    def error (self, category, doclet, msg):
+        self.add ('error', category, doclet, msg)
+
+    def get_limit (self, category):
+        if isinstance (self.limit, dict):
+            return self.limit.get (category, 0)
+        return self.limit or 0
+
+    def resolve (self):
+        """ Resolve the locations of all records.
+
+        :returns: a list of (filename, lineno, level, category, msg) sorted by
+                  filename, category and lineno
+        """
+        resolved = []
+        for level, category, doclet, msg in self.records:
+            filename, lineno = doclet.get_source_line ()
+            resolved.append ((filename, lineno, level, category, msg))
+        resolved.sort (key = operator.itemgetter (0, 3, 1))
+        return resolved
+
+    def write_report (self, resolved):
+        with open (self.report, 'w') as fp:
+            jsonlib.dump ([
+                {
+                    'filename' : filename,
+                    'lineno'   : lineno,
+                    'level'    : level,
+                    'category' : category,
+                    'message'  : msg,
+                } for filename, lineno, level, category, msg in resolved
+            ], fp, indent = 2)
+
+    def emit (self):
+        """ Output all recorded problems and clear the records. """
+
+        if not self.records:
+            return
+
+        resolved = self.resolve ()
+        if self.report:
+            self.write_report (resolved)
+
+        counts = collections.Counter ()
+        for (filename, category), group in itertools.groupby (
+                resolved, key = operator.itemgetter (0, 3)):
+            limit = self.get_limit (category)
+            lines = []
+            first_lineno = 0
+            level = 'warning'
+            for dummy_filename, lineno, lvl, dummy_category, msg in group:
+                counts[category] += 1
+                if limit and counts[category] > limit:
+                    continue
+                if lvl == 'error':
+                    level = 'error'
+                if not lines:
+                    first_lineno = lineno
+                lines.append ('%d: %s' % (lineno, msg))
+            if lines:
+                # a location without ':' would be taken for a docname by sphinx
+                getattr (logger, level) (
+                    '[%s] %s' % (category, '\n'.join (lines)),
+                    location = '%s:%d' % (filename, first_lineno)
+                )
+
+        for category, count in sorted (counts.items ()):
+            limit = self.get_limit (category)
+            if limit and count > limit:
+                logger.warning ('[%s] %d more problems suppressed (limit is %d)' %
+                                (category, count - limit, limit))
+
+        self.records = []
+
+
 class obj (object):
     """ Represents any object read in from the structure.json file. """
 
@@ -182,11 +328,19 @@ class Obj (obj):
             return self.parent.get_source_line ()
         return '<unknown>', 0
 
-    def error (self, msg):
-        logger.error (msg, location = '%s:%d' % self.get_source_line ())
+    def get_path (self):
+        """ Return the normalized path of the file this object is defined in, or None. """
+
+        # pylint: disable=no-member
+        if 'meta' in self:
+            return normalize_path (os.path.join (self.meta.path, self.meta.filename))
+        return None
 
-    def warn (self, msg):
-        logger.warn (msg, location = '%s:%d' % self.get_source_line ())
+    def get_lineno (self):
+        # pylint: disable=no-member
+        if 'meta' in self:
+            return self.meta.lineno
+        return 0
 
     def splitlines (self, text, indent):
         return [(' ' * indent) + s for s in text.splitlines ()]
@@ -228,6 +382,14 @@ class Obj (obj):
     def get_description (self):
         return normalize_space (self.description)
 
+    def get_summary (self):
+        """ Return the first sentence of the description. """
+        return self.get_description ().split ('. ')[0]
+
+    def renders_child (self, child, directive):
+        """ Return True if run () outputs child. """
+        return True
+
     def run (self, directive, indent):
         for node in self.children:
             node.run (directive, indent)
@@ -288,6 +450,9 @@ class JSThrows (JSWithTypes):
 
 class JSVariable (JSWithTypes):
 
+    def renders_child (self, child, directive):
+        return False
+
     def run (self, directive, indent):
         indent += 3
         types = self.get_types ()
@@ -329,6 +494,9 @@ class JSCallable (Obj):
         self.returns = []
         super ().__init__ (d)
 
+    def renders_child (self, child, directive):
+        return False
+
     def get_signature (self):
         if 'params' in self:
             args = [ p.name for p in self.params ]
@@ -368,6 +536,9 @@ class JSMethod (JSCallable):
 
 
 class JSClass (Obj):
+    def renders_child (self, child, directive):
+        return self.doc ()
+
     def run (self, directive, indent):
         if self.doc ():
             self.append (".. js:class:: %s" % self.get_name (), directive, indent)
@@ -415,10 +586,20 @@ class JSModule (Obj):
 
     """
 
-    def run (self, directive, indent):
+    def get_module_name (self):
         module = self.get_longname ()
         if module.startswith ('module:'):
             module = module[7:]
+        return module
+
+    def renders_child (self, child, directive):
+        members = directive.get_opt ('members')
+        if isinstance (members, list):
+            return child.get_name () in members
+        return members is True
+
+    def run (self, directive, indent):
+        module = self.get_module_name ()
 
         self.append (".. js:module:: %s" % module, directive, indent)
         self.nl (directive)
@@ -430,20 +611,442 @@ class JSModule (Obj):
 
         self.append_desc (directive, indent)
 
-        members = directive.get_opt ('members')
-        if members is True:
-            super ().run (directive, indent)
-        if isinstance (members, list):
-            for c in self.children:
-                if c.get_name () in members:
-                    c.run (directive, indent)
+        children = [ c for c in self.children if self.renders_child (c, directive) ]
+
+        splits = directive.get_splits (self)
+        if splits and children:
+            children = self.run_summary (splits, children, directive, indent)
+
+        for c in children:
+            c.run (directive, indent)
+        self.nl (directive)
+
+    def run_summary (self, splits, children, directive, indent):
+        """Output a summary table of the children that were split off into stub
+        documents and a hidden toctree to those documents.
+
+        :returns: the children that still have to be output on this page.
+        """
+
+        split_off = {}
+        for split in splits:
+            for c in split.children:
+                split_off[c.longname] = split
+
+        rows = [ c for c in children if c.longname in split_off ]
+        if not rows:
+            return children
+
+        self.append ('.. list-table::', directive, indent)
+        self.append ('   :widths: 30 70', directive, indent)
+        self.nl (directive)
+        for c in rows:
+            self.append ('   * - :%s:`%s`' % (directive.xref_table[c.kind], c.get_name ()),
+                         directive, indent)
+            self.append ('     - %s' % c.get_summary (), directive, indent)
+        self.nl (directive)
+
+        self.append ('.. toctree::', directive, indent)
+        self.append ('   :hidden:', directive, indent)
+        self.nl (directive)
+        for split in splits:
+            if any (split_off[c.longname] is split for c in rows):
+                self.append ('   /%s' % split.docname, directive, indent)
+        self.nl (directive)
+
+        return [ c for c in children if c.longname not in split_off ]
+
+
+Split = collections.namedtuple ('Split', 'docname title kind children')
+""" A group of module members moved into a generated stub document. """
+
+
+def obj_factory (d):
+    """ Transmogrify the dictionaries read from the json file into objects.
+    If the object has a known kind make it into a JS<kind> class,
+    else if it has an unknwon kind make it into an Obj
+    else if it has no kind (substructures of doclets) make it an obj
+    """
+    try:
+        kind = d['kind']
+        o = AutoDirective.vtable.get (kind, Obj) (d)
+    except KeyError:
+        o = obj (d)
+    return o
+
+
+class LineCounter (object):
+    """ Stands in for the directive and counts the RST lines a doclet would output. """
+
+    def __init__ (self, structure):
+        self.structure = structure
+        self.content   = self
+        self.lines     = 0
+
+    def append (self, line, source):
+        self.lines += 1
+
+    def get_opt (self, name, required = False):
+        if name == 'members':
+            return True
+        return self.structure.get_opt (name)
+
+    def get_splits (self, module):
+        return []
+
+    def xref (self, name):
+        return name
+
+
+class StructureFile (object):
+    """ All doclets read in from one structure.json file, merged and indexed. """
+
+    def __init__ (self, config):
+        self.config    = config
+        self.doclets   = []
+        self.names     = {}
+        self.longnames = {}
+        self.paths     = {}
+        self.memberofs = {}
+        self.splits    = {} # module longname => list of Split
+        self.docnames  = set () # docnames of all splits
+
+        self.diagnostics = Diagnostics (
+            self.get_opt ('diagnostics_limit'),
+            self.get_opt ('diagnostics_report'),
+        )
+
+
+    def get_opt (self, name):
+        return getattr (self.config, "%s_%s" % (NAME, name))
+
+
+    def load (self, filename):
+        with open (filename, 'r') as fp:
+            self.merge_doclets (jsonlib.load (fp, object_hook = obj_factory))
+        self.make_splits ()
+
+
+    def check_params (self, doclet):
+        """ Check for undocumented or incongruous params. """
+
+        if not doclet.undocumented:
+            try:
+                param_names      = { p.name for p in doclet.params }
+                meta_param_names = set (doclet.meta.code.paramnames)
+
+                for name in param_names - meta_param_names:
+                    self.diagnostics.warn (
+                        'unknown-param', doclet,
+                        "Documented parameter %s not found on signature" % name
+                    )
+
+                for name in meta_param_names - param_names:
+                    self.diagnostics.warn (
+                        'undocumented-param', doclet, "Undocumented parameter %s" % name
+                    )
+
+            except AttributeError:
+                pass
+
+        return doclet
+
+
+    def make_forest (self, doclets):
+        """The structure.json file contains a flat list of doclets.  Make it into a
+        forest of trees by adding parent and children attributes to each doclet
+        according to the attribute @memberof.
+
+        :param list doclets: a flat list of doclets
+
+        """
+
+        for o in doclets:
+            if o.memberof is None:
+                continue
+            if o.memberof in self.longnames:
+                o.parent = self.longnames[o.memberof]
+                o.parent.children.append (o)
+                continue
+            if o.doc ():
+                if o.memberof == '<anonymous>':
+                    self.diagnostics.error (
+                        'link-up', o,
+                        "Could not link up object %s to %s. "
+                        "Try giving the anonymous object an @alias." % (o.longname, o.memberof)
+                    )
+                else:
+                    self.diagnostics.error (
+                        'link-up', o,
+                        "Could not link up object %s to %s" % (o.longname, o.memberof)
+                    )
+
+
+    def make_indexes (self, doclets):
+        """Build the secondary indexes: normalized source path => doclets and
+        @memberof => longnames of children.
+
+        Must run after the merge because merging changes the meta attribute.
+
+        :param list doclets: a flat list of merged doclets
+
+        """
+
+        for o in doclets:
+            path = o.get_path ()
+            if path is not None:
+                self.paths.setdefault (path, []).append (o)
+            if o.memberof is not None:
+                self.memberofs.setdefault (o.memberof, []).append (o.longname)
+
+        for path_doclets in self.paths.values ():
+            path_doclets.sort (key = operator.methodcaller ('get_lineno'))
+
+
+    def merge_doclets (self, doclets):
+        """Occasionally JSDoc outputs one doclet for the object docblock and another
+        doclet for the object code (eg. if the docblock contains a @function tag
+        and is followed by a function.)  These represent the human view and the
+        compiler view of things respectively.
+
+        The same happens for exported objects. the 'export' keyword seems to get
+        its own doclet.
+
+        Here we merge all doclets with the same longname into one.
+
+        All problems found are collected and output in one go at the end.
+
+        """
+
+        for doclet in doclets:
+            last_doclet = self.longnames.setdefault (doclet.longname, doclet)
+
+            if doclet is last_doclet:
+                # first time seen
+                self.names[doclet.name] = doclet
+                self.doclets.append (self.check_params (doclet))
+            else:
+                last_doclet.undocumented &= doclet.undocumented
+                last_doclet.comment      += doclet.comment
+                last_doclet.description  += doclet.description
+                last_doclet.meta         =  doclet.meta  # prefer compilers view
+
+        self.make_forest (self.doclets)
+        self.make_indexes (self.doclets)
+        self.diagnostics.emit ()
+
+
+    def count_lines (self, doclets):
+        """ Count the RST lines the doclets would output. """
+
+        counter = LineCounter (self)
+        for d in doclets:
+            d.run (counter, 0)
+        return counter.lines
+
+
+    def make_docname (self, name):
+        """ Sanitize name into the docname of a stub in split_dir and make it unique. """
+
+        docname = '%s/%s' % (self.get_opt ('split_dir'), RE_DOCNAME.sub ('_', name))
+        unique = docname
+        n = 1
+        while unique in self.docnames:
+            n += 1
+            unique = '%s-%d' % (docname, n)
+        self.docnames.add (unique)
+        return unique
+
+
+    def make_splits (self):
+        """Decide which modules are too big for one page and which of their members
+        go into stub documents.
+
+        A module is too big if it has more documented members than
+        autojsdoc_split_members or outputs more lines than autojsdoc_split_lines.
+        Every class of a big module gets its own stub, the other members are
+        grouped by kind and a group gets a stub if it has at least
+        autojsdoc_split_group members.
+
+        """
+
+        max_members = self.get_opt ('split_members')
+        max_lines   = self.get_opt ('split_lines')
+        if not (max_members or max_lines):
+            return
+
+        for module in self.doclets:
+            if module.kind != 'module':
+                continue
+
+            children = [ c for c in module.children if c.doc () ]
+            oversized = max_members and len (children) > max_members
+            if max_lines and not oversized:
+                oversized = self.count_lines (children) > max_lines
+            if not oversized:
+                continue
+
+            basename = module.get_module_name ()
+            splits = []
+            groups = collections.OrderedDict ()
+            for c in children:
+                if c.kind == 'class':
+                    splits.append (Split (
+                        self.make_docname ('%s.classes.%s' % (basename, c.get_name ())),
+                        c.get_name (), c.kind, [c]
+                    ))
+                elif c.kind in SPLIT_TITLES:
+                    groups.setdefault (c.kind, []).append (c)
+
+            for kind, group in groups.items ():
+                if len (group) >= self.get_opt ('split_group'):
+                    splits.append (Split (
+                        self.make_docname ('%s.groups.%s' % (basename, SPLIT_TITLES[kind])),
+                        '%s %s' % (module.get_module_name (), SPLIT_TITLES[kind]),
+                        kind, group
+                    ))
+
+            if splits:
+                self.splits[module.longname] = splits
+
+
+def get_structure_file (config, filename):
+    """ Load and cache a structure file. """
+
+    if filename not in loaded_structure_files:
+        structure = StructureFile (config)
+        structure.load (filename)
+        loaded_structure_files[filename] = structure
+    return loaded_structure_files[filename]
+
+
+def load_structure_file (app):
+    """Load the structure file in autojsdoc_structure_json.
+
+    Runs on builder-inited in the main process, so that the diagnostics are
+    output and the report is written only once, and the forked read workers
+    inherit the loaded structure file.
+
+    """
+
+    filename = getattr (app.config, NAME + '_structure_json')
+    if filename:
+        get_structure_file (app.config, filename)
+
+
+def make_stub (module, split):
+    """ Return the RST source of the stub document for a split. """
+
+    title = split.title
+    lines = [
+        STUB_MARKER,
+        '',
+        ':orphan:',
+        '',
+        title,
+        '=' * len (title),
+        '',
+        '.. js:module:: %s' % module.get_module_name (),
+        '   :noindex:',
+        '',
+        '.. js:auto%s::' % split.kind,
+        '   :longnames:',
+        '',
+    ] + [
+        '   %s' % c.longname for c in split.children
+    ] + [
+        '',
+    ]
+    return '\n'.join (lines)
+
+
+def is_stub (path):
+    """ Return True if the file at path is a stub written by us. """
+
+    try:
+        with open (path, 'r') as fp:
+            return fp.readline ().rstrip ('\n') == STUB_MARKER
+    except IOError:
+        return False
+
+
+def write_stubs (app):
+    """Write the stub documents of split modules.
+
+    Runs on builder-inited, before Sphinx looks for source files, so that the
+    stubs are read and written like any other document (and in parallel).
+    Only the structure file in autojsdoc_structure_json is considered.
+    Stubs are only rewritten if their content has changed.
+
+    Stubs that are not generated any more are removed.  Files not written by
+    us are never overwritten nor removed.
+
+    """
+
+    config = app.config
+    filename = getattr (config, NAME + '_structure_json')
+    if not filename:
+        return
+    if not (getattr (config, NAME + '_split_members') or getattr (config, NAME + '_split_lines')):
+        return
+
+    srcdir = os.path.realpath (str (app.srcdir))
+    split_dir = os.path.realpath (os.path.join (srcdir, getattr (config, NAME + '_split_dir')))
+    if split_dir == srcdir or os.path.commonpath ([srcdir, split_dir]) != srcdir:
+        raise AutoJSDocError (
+            '%s_split_dir must be a subdirectory of the source directory' % NAME
+        )
+
+    # source_suffix is a dict since sphinx 1.8, a str or list before
+    suffix = config.source_suffix
+    if not isinstance (suffix, str):
+        suffix = next (iter (suffix))
+
+    generated = set ()
+    structure = get_structure_file (config, filename)
+    for longname, splits in structure.splits.items ():
+        module = structure.longnames[longname]
+        for split in splits:
+            path = os.path.join (srcdir, *split.docname.split ('/')) + suffix
+            generated.add (path)
+            text = make_stub (module, split)
+            if os.path.exists (path):
+                if not is_stub (path):
+                    logger.warning ('Not overwriting %s: not a stub generated by %s' %
+                                    (path, NAME))
+                    continue
+                with open (path, 'r') as fp:
+                    if fp.read () == text:
+                        continue
+            os.makedirs (os.path.dirname (path), exist_ok = True)
+            with open (path, 'w') as fp:
+                fp.write (text)
+
+    remove_stale_stubs (split_dir, suffix, generated)
+
+
+def remove_stale_stubs (split_dir, suffix, generated):
+    """ Remove the stubs in split_dir that were not generated in this run. """
+
+    if not os.path.isdir (split_dir):
+        return
+    for name in os.listdir (split_dir):
+        path = os.path.join (split_dir, name)
+        if name.endswith (suffix) and path not in generated and is_stub (path):
+            os.remove (path)
 
 
 class AutoDirective (SphinxDirective):
     """Directive to document a JS 'object'. """
 
-    required_arguments = 1
-    """Modules to autodoc.  A regex that matches @module tags in jsdoc."""
+    required_arguments = 0
+    """Modules to autodoc.  A regex that matches @module tags in jsdoc.
+
+    For js:autofile a glob that matches the source path.  A relative glob
+    matches the tail of the path.
+
+    At least one argument is required, unless the :longnames: option is given.
+    """
 
     optional_arguments = 999
     """More regexes that match @module tags.  If a following regex matches the same
@@ -453,12 +1056,14 @@ class AutoDirective (SphinxDirective):
 
     """
 
-    has_content = False
+    has_content = True
+    """ With the :longnames: option: the longnames to autodoc, one per line. """
 
     option_spec = {
         'structure_json' : directives.unchanged,
         'members'        : members_option,
         'title'          : bool_option,
+        'longnames'      : bool_option,
     }
     """structure_json
           Path of the structure.json file.
@@ -474,6 +1079,13 @@ class AutoDirective (SphinxDirective):
           Should the directive output a section title?
           Defaults to the config option autojsdoc_title.
           Default: False.
+
+       longnames
+          Autodoc the longnames in the content, one per line, instead of
+          matching regexes.  Looks the doclets up directly.  Used by the
+          generated stubs.  (Longnames may contain spaces and so cannot be
+          passed as arguments.)
+          Default: False.
     """
 
     vtable = {
@@ -530,91 +1142,83 @@ class AutoDirective (SphinxDirective):
         return name
 
 
-    def check_params (self, doclet):
-        """ Check for undocumented or incongruous params. """
-
-        if not doclet.undocumented:
-            try:
-                param_names      = { p.name for p in doclet.params }
-                meta_param_names = set (doclet.meta.code.paramnames)
-
-                for name in param_names - meta_param_names:
-                    doclet.warn ("Documented parameter %s not found on signature" % name)
-
-                for name in meta_param_names - param_names:
-                    doclet.warn ("Undocumented parameter %s" % name)
+    def get_splits (self, module):
+        """ Return the splits of a module.
 
-            except AttributeError:
-                pass
+        Stubs are only generated for the structure file in the config, so modules
+        from other structure files are never split.
+        """
 
-        return doclet
+        if self.structure_json != getattr (self.env.config, NAME + '_structure_json'):
+            return []
+        return self.structure.splits.get (module.longname, [])
 
 
-    def make_forest (self, doclets):
-        """The structure.json file contains a flat list of doclets.  Make it into a
-        forest of trees by adding parent and children attributes to each doclet
-        according to the attribute @memberof.
+    def grep_doclets (self, objtype):
+        """ Yield the doclets of kind objtype whose longname matches the arguments. """
 
-        :param list doclets: a flat list of doclets
+        if 'longnames' in self.options:
+            for longname in collections.OrderedDict.fromkeys (self.longname_list):
+                d = self.longnames.get (longname)
+                if d is not None and d.kind == objtype:
+                    yield d
+            return
 
-        """
+        visited = set () # remember which objects we have already output
+        for argument in self.arguments:
+            rex = re.compile (argument)
 
-        for o in doclets:
-            if o.memberof is None:
-                continue
-            if o.memberof in self.longnames:
-                o.parent = self.longnames[o.memberof]
-                o.parent.children.append (o)
-                continue
-            if o.doc ():
-                if o.memberof == '<anonymous>':
-                    o.error ("""Could not link up object %s to %s.
-                             Try giving the anonymous object an @alias."""
-                             % (o.longname, o.memberof))
-                else:
-                    o.error ("Could not link up object %s to %s" % (o.longname, o.memberof))
+            # grep the list of doclets
+            doclets = (
+                d for d in self.doclets
+                if d.kind == objtype
+                and rex.search (d.longname)
+                and d.longname not in visited
+            )
 
+            for d in sorted (doclets, key = operator.attrgetter ('longname')):
+                visited.add (d.longname)
+                yield d
 
-    def merge_doclets (self, doclets):
-        """Occasionally JSDoc outputs one doclet for the object docblock and another
-        doclet for the object code (eg. if the docblock contains a @function tag
-        and is followed by a function.)  These represent the human view and the
-        compiler view of things respectively.
 
-        The same happens for exported objects. the 'export' keyword seems to get
-        its own doclet.
+    def glob_doclets (self):
+        """Yield the doclets defined in the files whose paths match the arguments.
 
-        Here we merge all doclets with the same longname into one.
+        Members of a doclet that is itself output are left to their parent,
+        but only if the parent outputs them.
 
         """
 
-        merged = []
-        names = {}
-        longnames = {}
-
-        for doclet in doclets:
-            last_doclet = self.longnames.setdefault (doclet.longname, doclet)
-
-            if doclet is last_doclet:
-                # first time seen
-                self.names[doclet.name] = doclet
-                merged.append (self.check_params (doclet))
-            else:
-                last_doclet.undocumented &= doclet.undocumented
-                last_doclet.comment      += doclet.comment
-                last_doclet.description  += doclet.description
-                last_doclet.meta         =  doclet.meta  # prefer compilers view
+        all_paths = sorted (self.paths.keys ())
+        paths = collections.OrderedDict ()
+        for argument in self.arguments:
+            # PurePath.match: '*' does not match '/' and a relative glob
+            # matches the tail of the path
+            pattern = normalize_path (argument)
+            for p in all_paths:
+                if p not in paths and pathlib.PurePath (p).match (pattern):
+                    paths[p] = True
+
+        doclets = [ d for p in paths for d in self.paths[p] ]
+
+        covered = set ()
+        for d in doclets:
+            covered.update (
+                c for c in self.memberofs.get (d.longname, [])
+                if d.renders_child (self.longnames[c], self)
+            )
 
-        self.make_forest (merged)
-        return merged, names, longnames
+        for d in doclets:
+            if d.longname not in covered:
+                yield d
 
 
     def run (self):
-        self.doclets = []
-        self.names = {}
-        self.longnames = {}
-
         structure_json = self.get_opt ('structure_json', True)
+        if not self.arguments and 'longnames' not in self.options:
+            raise self.error ('"%s" directive requires at least one argument.' % self.name)
+
+        self.longname_list = [ line.strip () for line in self.content if line.strip () ]
 
         parent = docutils.nodes.section ()
         parent.document = self.state.document
@@ -622,45 +1226,24 @@ class AutoDirective (SphinxDirective):
 
         self.content = StringList ()
 
-        def obj_factory (d):
-            """ Transmogrify the dictionaries read from the json file into objects.
-            If the object has a known kind make it into a JS<kind> class,
-            else if it has an unknwon kind make it into an Obj
-            else if it has no kind (substructures of doclets) make it an obj
-            """
-            try:
-                kind = d['kind']
-                o = self.vtable.get (kind, Obj) (d)
-            except KeyError:
-                o = obj (d)
-            return o
-
-        # load and cache structure file
-        if structure_json not in loaded_structure_files:
-            with open (structure_json, 'r') as fp:
-                self.state.document.settings.record_dependencies.add (structure_json)
-                loaded_structure_files[structure_json] = \
-                    self.merge_doclets (jsonlib.load (fp, object_hook = obj_factory))
-
-        # get cached structure file
-        self.doclets, self.names, self.longnames = loaded_structure_files[structure_json]
+        self.state.document.settings.record_dependencies.add (structure_json)
+        self.structure_json = structure_json
+        self.structure = get_structure_file (self.env.config, structure_json)
+
+        self.doclets   = self.structure.doclets
+        self.names     = self.structure.names
+        self.longnames = self.structure.longnames
+        self.paths     = self.structure.paths
+        self.memberofs = self.structure.memberofs
 
         try:
-            visited = set () # remember which objects we have already output
-            for argument in self.arguments:
-                rex = re.compile (argument)
-
-                # grep the list of doclets
-                doclets = (
-                    d for d in self.doclets
-                    if d.kind == objtype
-                    and rex.search (d.longname)
-                    and d.longname not in visited
-                )
+            if objtype == 'file':
+                doclets = self.glob_doclets ()
+            else:
+                doclets = self.grep_doclets (objtype)
 
-                for d in sorted (doclets, key = operator.attrgetter ('longname')):
-                    visited.add (d.longname)
-                    d.run (self, 0)
+            for d in doclets:
+                d.run (self, 0)
 
             with switch_source_input (self.state, self.content):
                 # logger.info (self.content.pprint ())
@@ -6,4 +6,23 @@
     :license: BSD, see LICENSE for details.
 """
 
+import pathlib
+
+import pytest
+
+from sphinxcontrib.autojsdoc import loaded_structure_files
+
 pytest_plugins = 'sphinx.testing.fixtures'
+
+
+@pytest.fixture (scope = 'session')
+def rootdir ():
+    return pathlib.Path (__file__).parent.absolute () / 'roots'
+
+
+@pytest.fixture (autouse = True)
+def clear_structure_files ():
+    """ Every test app must load its own structure file. """
+    loaded_structure_files.clear ()
+    yield
+    loaded_structure_files.clear ()
@@ -0,0 +1,5 @@
+import os
+
+extensions = ['sphinxcontrib.autojsdoc']
+
+autojsdoc_structure_json = os.path.join (os.path.dirname (__file__), 'structure.json')
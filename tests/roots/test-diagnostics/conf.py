@@ -0,0 +1,7 @@
+import os
+
+extensions = ['sphinxcontrib.autojsdoc']
+
+autojsdoc_structure_json     = os.path.join (os.path.dirname (__file__), 'structure.json')
+autojsdoc_diagnostics_limit  = { 'undocumented-param' : 2 }
+autojsdoc_diagnostics_report = os.path.join (os.path.dirname (__file__), 'diagnostics.json')
@@ -0,0 +1,7 @@
+import os
+
+extensions = ['sphinxcontrib.autojsdoc']
+
+autojsdoc_structure_json = os.path.join (os.path.dirname (__file__), 'structure.json')
+autojsdoc_split_members  = 3
+autojsdoc_split_group    = 2
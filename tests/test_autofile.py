@@ -0,0 +1,106 @@
+"""
+    test_autofile
+    ~~~~~~~~~~~~~
+
+    Test the js:autofile directive and the source path and memberof indexes.
+
+    :copyright: Copyright 2019 by Marcello Perathoner <marcello@perathoner.de>
+    :license: BSD, see LICENSE for details.
+"""
+
+import pytest
+
+from sphinxcontrib.autojsdoc import loaded_structure_files
+
+
+def get_text (app, docname):
+    return (app.outdir / (docname + '.txt')).read_text ()
+
+
+def get_order (text, names):
+    """ Return names in the order they first appear in text. """
+    return sorted (names, key = text.index)
+
+
+@pytest.mark.sphinx ('text', testroot = 'autofile', srcdir = 'autofile')
+def test_indexes (app):
+    app.build ()
+    structure = list (loaded_structure_files.values ())[0]
+
+    assert sorted (structure.paths.keys ()) == [
+        '/src/lib/mod.js', '/src/lib/sub/deep.js', '/src/other/other.js'
+    ]
+    # in source line order
+    assert [ d.name for d in structure.paths['/src/lib/mod.js'] ] == [
+        'mod', 'fun_a', 'Klass', 'meth', 'fun_b', 'fun_c',
+        'outer', 'inner', 'Hidden', 'shown', 'CONF', 'key'
+    ]
+    assert structure.memberofs == {
+        'module:mod'        : [ 'module:mod.fun_c', 'module:mod.fun_a',
+                                'module:mod.Klass', 'module:mod.fun_b',
+                                'module:mod.outer', 'module:mod.Hidden',
+                                'module:mod.CONF' ],
+        'module:mod.Klass'  : [ 'module:mod.Klass#meth' ],
+        'module:mod.outer'  : [ 'module:mod.outer.inner' ],
+        'module:mod.Hidden' : [ 'module:mod.Hidden#shown' ],
+        'module:mod.CONF'   : [ 'module:mod.CONF.key' ],
+    }
+
+
+@pytest.mark.sphinx ('text', testroot = 'autofile', srcdir = 'autofile')
+def test_relative_glob (app):
+    app.build ()
+    text = get_text (app, 'relative')
+
+    # '*' does not match across directories
+    assert 'deep_fun' not in text
+    assert 'other_fun' not in text
+
+    # output in source line order
+    assert get_order (text, ['Description of mod', 'fun_a', 'Klass', 'fun_b', 'fun_c']) == \
+        ['Description of mod', 'fun_a', 'Klass', 'fun_b', 'fun_c']
+
+    # without :members: every doclet is output once, the method by its class
+    for name in ('fun_a', 'fun_b', 'fun_c', 'Klass.meth'):
+        assert text.count ('%s()' % name) == 1
+
+
+@pytest.mark.sphinx ('text', testroot = 'autofile', srcdir = 'autofile')
+def test_absolute_glob (app):
+    app.build ()
+    text = get_text (app, 'absolute')
+
+    assert 'other_fun()' in text
+    assert 'fun_a' not in text
+    assert 'deep_fun' not in text
+
+
+@pytest.mark.sphinx ('text', testroot = 'autofile', srcdir = 'autofile')
+def test_members (app):
+    app.build ()
+
+    # the module outputs all members, the file outputs nothing more
+    text = get_text (app, 'members')
+    for name in ('fun_a', 'fun_b', 'fun_c', 'Klass.meth'):
+        assert text.count ('%s()' % name) == 1
+
+    # the module outputs fun_b, the file outputs the rest in line order
+    text = get_text (app, 'members_list')
+    for name in ('fun_a', 'fun_b', 'fun_c', 'Klass.meth'):
+        assert text.count ('%s()' % name) == 1
+    assert get_order (text, ['fun_b', 'fun_a', 'Klass', 'fun_c']) == \
+        ['fun_b', 'fun_a', 'Klass', 'fun_c']
+
+
+@pytest.mark.sphinx ('text', testroot = 'autofile', srcdir = 'autofile')
+def test_parent_does_not_output_members (app):
+    app.build ()
+
+    # functions, constants and undocumented classes do not output their
+    # members, so the file does
+    for docname in ('relative', 'members', 'members_list'):
+        text = get_text (app, docname)
+        assert text.count ('Description of inner.') == 1
+        assert text.count ('Description of shown.') == 1
+        assert text.count ('Description of key.') == 1
+        assert 'Hidden' not in text
@@ -0,0 +1,62 @@
+"""
+    test_diagnostics
+    ~~~~~~~~~~~~~~~~
+
+    Test the collection and output of the diagnostics found while loading the
+    structure file.
+
+    :copyright: Copyright 2019 by Marcello Perathoner <marcello@perathoner.de>
+    :license: BSD, see LICENSE for details.
+"""
+
+import json
+
+import pytest
+
+
+@pytest.mark.sphinx ('html', testroot = 'diagnostics', srcdir = 'diagnostics')
+def test_diagnostics (app, status, warning):
+    app.build ()
+    warnings = warning.getvalue ()
+
+    # grouped by file and category, located at the first problem in the group
+    assert '/src/a.js:10: WARNING: [undocumented-param] 10: Undocumented parameter y\n' \
+        '20: Undocumented parameter ' in warnings
+    assert '/src/b.js:5: WARNING: [unknown-param] 5: ' \
+        'Documented parameter w not found on signature' in warnings
+    assert '/src/b.js:7: ERROR: [link-up] 7: Could not link up object f4 to nowhere' in warnings
+    assert '.rst' not in warnings
+
+    # capped at 2 per category
+    assert 'Undocumented parameter v' not in warnings
+    assert '[undocumented-param] 2 more problems suppressed (limit is 2)' in warnings
+    assert warnings.count ('suppressed') == 1
+
+    # the report contains everything
+    with open (str (app.srcdir / 'diagnostics.json')) as fp:
+        report = json.load (fp)
+    assert len (report) == 6
+    assert { r['category'] for r in report } == {
+        'undocumented-param', 'unknown-param', 'link-up'
+    }
+    assert {
+        'filename' : '/src/b.js',
+        'lineno'   : 5,
+        'level'    : 'warning',
+        'category' : 'undocumented-param',
+        'message'  : 'Undocumented parameter v',
+    } in report
+
+    # no complaint about the type of the config value
+    assert 'autojsdoc_diagnostics_limit' not in warnings
+
+
+@pytest.mark.sphinx ('html', testroot = 'diagnostics', srcdir = 'diagnostics-parallel',
+                     parallel = 4)
+def test_diagnostics_parallel (app, status, warning):
+    app.build ()
+    warnings = warning.getvalue ()
+
+    # the structure file is loaded once before the read workers start
+    assert warnings.count ('[link-up]') == 1
+    assert warnings.count ('[undocumented-param] 2 more problems suppressed') == 1
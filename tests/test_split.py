@@ -0,0 +1,179 @@
+"""
+    test_split
+    ~~~~~~~~~~
+
+    Test the splitting of oversized modules into generated stub documents.
+
+    :copyright: Copyright 2019 by Marcello Perathoner <marcello@perathoner.de>
+    :license: BSD, see LICENSE for details.
+"""
+
+import os
+
+import pytest
+
+from sphinxcontrib.autojsdoc import STUB_MARKER, AutoJSDocError, loaded_structure_files
+
+STUBS = [
+    'big.classes.Klass.rst',
+    'big.classes.We_ird.rst',
+    'big.classes._a_b_.rst',
+    'big.classes.functions.rst',
+    'big.groups.functions.rst',
+]
+
+
+def get_stubs (app):
+    split_dir = app.srcdir / 'autojsdoc'
+    if not split_dir.is_dir ():
+        return []
+    return sorted (os.listdir (str (split_dir)))
+
+
+@pytest.mark.sphinx ('html', testroot = 'split', srcdir = 'split')
+def test_stubs (app):
+    app.build ()
+
+    assert get_stubs (app) == STUBS
+
+    stub = (app.srcdir / 'autojsdoc' / 'big.classes.We_ird.rst').read_text ()
+    assert stub == (
+        '.. generated by sphinxcontrib.autojsdoc, do not edit\n'
+        '\n'
+        ':orphan:\n'
+        '\n'
+        'We$ird\n'
+        '======\n'
+        '\n'
+        '.. js:module:: big\n'
+        '   :noindex:\n'
+        '\n'
+        '.. js:autoclass::\n'
+        '   :longnames:\n'
+        '\n'
+        '   module:big.We$ird\n'
+    )
+
+    # the marker does not hide the :orphan: field
+    assert 'orphan' in app.env.metadata['autojsdoc/big.classes.We_ird']
+
+    stub = (app.srcdir / 'autojsdoc' / 'big.groups.functions.rst').read_text ()
+    assert '.. js:autofunction::\n' \
+        '   :longnames:\n' \
+        '\n' \
+        '   module:big.fun_a\n' \
+        '   module:big.fun_b\n' \
+        '   module:big.fun_c\n' in stub
+
+    # the class named 'functions' did not overwrite the group
+    stub = (app.srcdir / 'autojsdoc' / 'big.classes.functions.rst').read_text ()
+    assert '   module:big.functions\n' in stub
+
+    # longnames with spaces are looked up whole
+    html = (app.outdir / 'autojsdoc' / 'big.classes._a_b_.html').read_text ()
+    assert 'id="big.-a-b"' in html
+
+    html = (app.outdir / 'autojsdoc' / 'big.groups.functions.html').read_text ()
+    for name in ('fun_a', 'fun_b', 'fun_c'):
+        assert 'id="big.%s"' % name in html
+
+
+@pytest.mark.sphinx ('html', testroot = 'split', srcdir = 'split')
+def test_module_page (app, warning):
+    app.build ()
+    html = (app.outdir / 'index.html').read_text ()
+
+    # the summary table
+    assert '<td><p>Summary of Klass</p></td>' in html
+    assert 'href="autojsdoc/big.classes.Klass.html#big.Klass"' in html
+    assert 'href="autojsdoc/big.classes.functions.html#big.functions"' in html
+    assert 'href="autojsdoc/big.groups.functions.html#big.fun_b"' in html
+
+    # the hidden toctree
+    assert app.env.toctree_includes['index'] == [
+        'autojsdoc/big.classes.Klass',
+        'autojsdoc/big.classes.functions',
+        'autojsdoc/big.classes.We_ird',
+        'autojsdoc/big.classes._a_b_',
+        'autojsdoc/big.groups.functions',
+    ]
+
+    # the constants group is too small and stays on the module page
+    assert 'id="big.CONST"' in html
+    assert 'id="big.Klass"' not in html
+    assert 'id="big.fun_a"' not in html
+
+    # xrefs from the rest of the page resolve to the stubs
+    assert '<p>See <a class="reference internal" ' \
+        'href="autojsdoc/big.classes.Klass.html#big.Klass"' in html
+
+    assert warning.getvalue () == ''
+
+
+@pytest.mark.sphinx ('html', testroot = 'split', srcdir = 'split-lines',
+                     confoverrides = { 'autojsdoc_split_members' : 0,
+                                       'autojsdoc_split_lines'   : 10 })
+def test_split_lines (app):
+    app.build ()
+
+    assert get_stubs (app) == STUBS
+
+
+@pytest.mark.sphinx ('html', testroot = 'split', srcdir = 'split-off',
+                     confoverrides = { 'autojsdoc_split_members' : 0 })
+def test_no_split (app):
+    app.build ()
+    html = (app.outdir / 'index.html').read_text ()
+
+    assert get_stubs (app) == []
+    assert 'id="big.Klass"' in html
+    assert 'id="big.fun_a"' in html
+    assert 'toctree-wrapper' not in html
+
+
+@pytest.mark.sphinx ('html', testroot = 'split', srcdir = 'split-stale')
+def test_stale_stubs (app_params, make_app):
+    args, kwargs = app_params
+
+    app = make_app (*args, **kwargs)
+    split_dir = app.srcdir / 'autojsdoc'
+    (split_dir / 'big.classes.Gone.rst').write_text (STUB_MARKER + '\n\nstale\n')
+    (split_dir / 'guide.rst').write_text ('Guide\n=====\n')
+    (split_dir / 'big.classes.Klass.rst').write_text ('Not a stub\n')
+
+    # stubs not generated any more are removed, other files are left alone
+    loaded_structure_files.clear ()
+    app = make_app (*args, **kwargs)
+    assert get_stubs (app) == sorted (STUBS + ['guide.rst'])
+    assert (split_dir / 'big.classes.Klass.rst').read_text () == 'Not a stub\n'
+    assert (split_dir / 'guide.rst').read_text () == 'Guide\n=====\n'
+
+    # nothing is removed if splitting is off
+    (split_dir / 'big.classes.Gone.rst').write_text (STUB_MARKER + '\n\nstale\n')
+    loaded_structure_files.clear ()
+    kwargs['confoverrides'] = { 'autojsdoc_split_members' : 0 }
+    app = make_app (*args, **kwargs)
+    assert 'big.classes.Gone.rst' in get_stubs (app)
+
+
+@pytest.mark.parametrize ('split_dir', ['', '.', '..', '../elsewhere'])
+@pytest.mark.sphinx ('html', testroot = 'split', srcdir = 'split-dir')
+def test_split_dir_outside (app_params, make_app, split_dir):
+    args, kwargs = app_params
+    kwargs['confoverrides'] = { 'autojsdoc_split_dir' : split_dir }
+
+    with pytest.raises (AutoJSDocError):
+        make_app (*args, **kwargs)
+    assert os.path.exists (str (kwargs['srcdir'] / 'index.rst'))
+
+
+@pytest.mark.sphinx ('html', testroot = 'split', srcdir = 'split-suffix',
+                     confoverrides = { 'source_suffix' : { '.txt' : 'restructuredtext',
+                                                           '.rst' : 'restructuredtext' } })
+def test_source_suffix (app, warning):
+    app.build ()
+
+    # stubs get the first source suffix
+    assert get_stubs (app) == [ s.replace ('.rst', '.txt') for s in STUBS ]
+    assert 'autojsdoc/big.classes.Klass' in app.env.found_docs
+    assert warning.getvalue () == ''